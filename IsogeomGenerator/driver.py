@@ -5,7 +5,6 @@ geometry creation.
 import os
 import warnings
 import numpy as np
-import math as m
 
 
 def generate_levels(N, minN, maxN, mode='lin'):
@@ -22,9 +21,9 @@ def generate_levels(N, minN, maxN, mode='lin'):
         mode: str, options are 'lin' (default), 'log', or 'ratio'.
             lin: N linearly spaced values between minN and maxN
             log: N logarithmically spaced values between minN and maxN
-            ratio: levels that are spaced by a constant ratio N.
-                minN will be used as minimum level value and the maximum
-                level value is less than or equal to maxN.
+            ratio: levels that are spaced by a constant ratio N (N > 1).
+                minN (minN > 0) will be used as minimum level value and
+                the maximum level value is less than or equal to maxN.
 
     Returns:
     --------
@@ -37,23 +36,39 @@ def generate_levels(N, minN, maxN, mode='lin'):
 
     if mode == 'log':
         base = 10.
-        start = m.log(minN, base)
-        stop = m.log(maxN, base)
+        start = np.log10(minN)
+        stop = np.log10(maxN)
         levels = list(np.logspace(start, stop, num=N,
                                   endpoint=True, base=base))
         return levels
 
     if mode == 'ratio':
         # set minN as the minimum and get all other values until maxN
-        tmpmax = 0.
-        levels = [minN]
-        while tmpmax < maxN:
-            next_val = levels[-1] * float(N)
-            if next_val <= maxN:
-                levels.append(next_val)
-                tmpmax = next_val
-            else:
-                break
+        # (levels are minN * N^k for k = 0, 1, 2, ...)
+        N = float(N)
+        if N <= 1.:
+            raise RuntimeError("Ratio N must be greater than 1 to " +
+                               "generate levels in ratio mode.")
+        if minN <= 0.:
+            raise RuntimeError("Minimum level value minN must be greater " +
+                               "than 0 to generate levels in ratio mode.")
+        if maxN > minN:
+            num = int(np.floor(np.log(maxN / minN) / np.log(N))) + 2
+        else:
+            num = 1
+        # successive products give the same values as multiplying by N
+        # one level at a time
+        levels = np.cumprod(np.append(minN, np.full(num - 1, N)))
+        # only keep values that do not exceed maxN, allowing for rounding
+        # (always keep minN)
+        tol = 1e-9
+        keep = levels <= maxN * (1. + tol)
+        keep[0] = True
+        levels = levels[keep]
+        # a level within rounding of maxN is set to exactly maxN
+        if abs(levels[-1] - maxN) <= abs(maxN) * tol:
+            levels[-1] = maxN
+        levels = list(levels)
         return levels
 
     raise RuntimeError("Level generation mode {} not " +
@@ -181,7 +196,7 @@ def create_geometry(isogeom, ivdb=None, data=None, dbname=None,
         isogeom.db = os.getcwd() + "/tmp"
 
     # check that the database folder exists:
-    if not os.path.exists(isogeom.db + '/vols/'):
+    if not os.path.exists(os.path.join(isogeom.db, 'vols')):
         raise RuntimeError('Database {} does not '.format(isogeom.db) +
                            'contain an isovolume database.')
 
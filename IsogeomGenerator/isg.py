@@ -4,12 +4,21 @@ import shutil
 import warnings
 import numpy as np
 import math as m
+from scipy.sparse import csr_matrix
+from scipy.sparse.csgraph import connected_components
+from scipy.spatial import cKDTree
 
 from isg_gen import IsoGeomGen
 
 from pymoab import core, types
 from pymoab.rng import Range, unite
 
+# null entity handle (used for an unassigned backward sense)
+_ZERO_EH = np.uint64(0)
+
+# file types that the geometry can be written as
+_VALID_EXTS = frozenset(['h5m', 'vtk'])
+
 
 class IsGm(IsoGeomGen):
     """Class containing necessary methods for generating a full mesh
@@ -27,6 +36,9 @@ class IsGm(IsoGeomGen):
             surface, and volume entity handles to each other.
         val_tag: MOAB tag entity handle, tag for surface value
         sense_tag: MOAB tag entity handle, tag for surface sense
+        geom_dim_tag: MOAB tag entity handle, tag for geometry dimension
+        category_tag: MOAB tag entity handle, tag for geometry category
+        global_id_tag: MOAB tag entity handle, tag for geometry ID
 
     Methods:
     --------
@@ -70,6 +82,21 @@ class IsGm(IsoGeomGen):
                                    tag_type=types.MB_TYPE_HANDLE,
                                    storage_type=types.MB_TAG_SPARSE,
                                    create_if_missing=True)
+        self.geom_dim_tag = \
+            self.mb.tag_get_handle('GEOM_DIMENSION', size=1,
+                                   tag_type=types.MB_TYPE_INTEGER,
+                                   storage_type=types.MB_TAG_SPARSE,
+                                   create_if_missing=True)
+        self.category_tag = \
+            self.mb.tag_get_handle('CATEGORY', size=32,
+                                   tag_type=types.MB_TYPE_OPAQUE,
+                                   storage_type=types.MB_TAG_SPARSE,
+                                   create_if_missing=True)
+        self.global_id_tag = \
+            self.mb.tag_get_handle('GLOBAL_ID', size=1,
+                                   tag_type=types.MB_TYPE_INTEGER,
+                                   storage_type=types.MB_TAG_SPARSE,
+                                   create_if_missing=True)
 
     def read_ivdb(self, ivdb):
         """read information from IvDb object.
@@ -101,16 +128,18 @@ class IsGm(IsoGeomGen):
             raise RuntimeError("Object must have levels defined.")
 
         # check there are correct number of files:
-        file_list = sorted(os.listdir(self.db + "/vols/"))
+        vols_dir = os.path.join(self.db, "vols")
+        file_list = [f for f in os.listdir(vols_dir) if f.endswith(".stl")]
         if len(self.levels) != len(file_list):
             raise RuntimeError("Number of levels does not match number of " +
                                "isovolume files in the database.")
 
-        # read files
-        for f in file_list:
+        # read files in numerical order of the isovolume index
+        # (file name must be an integer, eg. 0.stl)
+        file_list = sorted((int(f[:-4]), f) for f in file_list)
+        for i, f in file_list:
             # get file name
-            fpath = self.db + "/vols/" + f
-            i = int(f.strip(".stl"))  # must be an integer
+            fpath = os.path.join(vols_dir, f)
 
             # load file and create EH for file-set
             fs = self.mb.create_meshset()
@@ -147,17 +176,16 @@ class IsGm(IsoGeomGen):
 
             # get all triangles and check if the centroid is on an
             # exterior surface.
-            all_tris = self.mb.get_entities_by_type(fs, types.MBTRI)
-            tris_exterior = []
-            tris_interior = []
-            for tri in all_tris:
-                tri_verts = self.mb.get_connectivity(Range(tri))
-                coords = self.mb.get_coords(tri_verts)
-                centroid = self.__calc_centroid(coords)
-                if self.__check_exterior(centroid):
-                    tris_exterior.append(tri)
-                else:
-                    tris_interior.append(tri)
+            all_tris = np.asarray(self.mb.get_entities_by_type(fs,
+                                                               types.MBTRI),
+                                  dtype=np.uint64)
+            tri_verts = np.asarray(self.mb.get_connectivity(all_tris),
+                                   dtype=np.uint64)
+            coords = self.mb.get_coords(tri_verts)
+            centroids = self.__calc_centroid(coords)
+            exterior = self.__check_exterior(centroids)
+            tris_exterior = all_tris[exterior]
+            tris_interior = all_tris[~exterior]
 
             # get all interior and exterior vertices
             verts_interior = self.mb.get_adjacencies(
@@ -204,105 +232,122 @@ class IsGm(IsoGeomGen):
         ------
             norm: float, All data values will be multiplied by this factor.
         """
-        # get list of all original isovolumes
-        all_vols = sorted(self.isovol_meshsets.keys())
+        # get list of all original isovolumes in order of their index
+        all_vols = sorted(self.isovol_meshsets.keys(), key=lambda iv: iv[0])
+        merged_surfs = set()
         for i, isovol in enumerate(all_vols):
             if i != len(self.levels) - 1:
                 # do not need to check the last isovolume because it
                 # will be checked against its neighbor already
-                self.__compare_surfs(isovol, all_vols[i + 1], norm)
+                merged_surfs.update(
+                    self.__compare_surfs(isovol, all_vols[i + 1], norm))
 
         # if a surface doesn't have a value tagged after merging
         # give it a value of 0 and tag forward sense
+        untagged_surfs = []
+        senses = []
         for isovol in all_vols:
             for surf in self.isovol_meshsets[isovol]['surfs_EH']:
-
-                # tag val=0
-                try:
-                    val = self.mb.tag_get_data(self.val_tag, surf)
-                except:
-                    val = 0.0
-                    self.mb.tag_set_data(self.val_tag, surf, val)
-                    verts = \
-                        self.mb.get_entities_by_type(surf,
-                                                     types.MBVERTEX)
-                    tris = self.__get_surf_triangles(verts)
-                    self.mb.add_entities(surf, tris)
-
-                # tag fwd sense
-                try:
-                    sense = self.mb.tag_get_data(self.sense_tag, surf)
-                except:
-                    fwd = isovol[1]
-                    bwd = np.uint64(0)
-                    self.mb.tag_set_data(self.sense_tag,
-                                         surf, [fwd, bwd])
+                if surf in merged_surfs:
+                    # val and sense already tagged when merged
+                    continue
+                untagged_surfs.append(surf)
+                senses.extend([isovol[1], _ZERO_EH])
+                verts = \
+                    self.mb.get_entities_by_type(surf, types.MBVERTEX)
+                tris = self.__get_surf_triangles(verts)
+                self.mb.add_entities(surf, tris)
+
+        # tag val=0 and fwd sense on all untagged surfaces at once
+        if untagged_surfs:
+            self.mb.tag_set_data(self.val_tag, untagged_surfs,
+                                 np.zeros(len(untagged_surfs)))
+            self.mb.tag_set_data(self.sense_tag, untagged_surfs,
+                                 np.array(senses, dtype=np.uint64))
 
     def make_family(self):
         """Makes the correct parent-child relationships with volumes
         and surfaces. Tags geometry type, category, and ID on surfaces
         and volumes.
         """
-        # create geometry dimension, category, and global id tags
-        geom_dim = \
-            self.mb.tag_get_handle('GEOM_DIMENSION', size=1,
-                                   tag_type=types.MB_TYPE_INTEGER,
-                                   storage_type=types.MB_TAG_SPARSE,
-                                   create_if_missing=True)
-        category = \
-            self.mb.tag_get_handle('CATEGORY', size=32,
-                                   tag_type=types.MB_TYPE_OPAQUE,
-                                   storage_type=types.MB_TAG_SPARSE,
-                                   create_if_missing=True)
-        global_id = \
-            self.mb.tag_get_handle('GLOBAL_ID', size=1,
-                                   tag_type=types.MB_TYPE_INTEGER,
-                                   storage_type=types.MB_TAG_SPARSE,
-                                   create_if_missing=True)
+        # geometry dimension, category, and global id tags
+        geom_dim = self.geom_dim_tag
+        category = self.category_tag
+        global_id = self.global_id_tag
 
-        vol_id = 0
-        surf_id = 0
-        completed_surf_list = []
-        for v in self.isovol_meshsets.keys():
+        # create relationships and get all volumes and unique surfaces
+        vol_list = []
+        surf_list = []
+        completed_surfs = set()
+        for v, iv_data in self.isovol_meshsets.items():
             vol_eh = v[1]
+            vol_list.append(vol_eh)
 
-            # tag volume
-            self.mb.tag_set_data(geom_dim, vol_eh, 3)
-            self.mb.tag_set_data(category, vol_eh, 'Volume')
-            vol_id += 1
-            self.mb.tag_set_data(global_id, vol_eh, vol_id)
-
-            for surf_eh in self.isovol_meshsets[v]['surfs_EH']:
+            for surf_eh in iv_data['surfs_EH']:
                 # create relationship
                 self.mb.add_parent_child(vol_eh, surf_eh)
 
-                # tag surfaces (if not already done)
-                if surf_eh not in completed_surf_list:
-                    self.mb.tag_set_data(geom_dim, surf_eh, 2)
-                    self.mb.tag_set_data(category, surf_eh, 'Surface')
-                    surf_id += 1
-                    self.mb.tag_set_data(global_id, surf_eh, surf_id)
-                    completed_surf_list.append(surf_eh)
+                # store surface to be tagged (if not already stored)
+                if surf_eh not in completed_surfs:
+                    surf_list.append(surf_eh)
+                    completed_surfs.add(surf_eh)
+
+        # tag volumes
+        num_vols = len(vol_list)
+        self.mb.tag_set_data(geom_dim, vol_list,
+                             np.full(num_vols, 3, dtype=np.int32))
+        self.mb.tag_set_data(category, vol_list,
+                             np.full(num_vols, b'Volume', dtype='S32'))
+        self.mb.tag_set_data(global_id, vol_list,
+                             np.arange(1, num_vols + 1, dtype=np.int32))
+
+        # tag surfaces
+        num_surfs = len(surf_list)
+        self.mb.tag_set_data(geom_dim, surf_list,
+                             np.full(num_surfs, 2, dtype=np.int32))
+        self.mb.tag_set_data(category, surf_list,
+                             np.full(num_surfs, b'Surface', dtype='S32'))
+        self.mb.tag_set_data(global_id, surf_list,
+                             np.arange(1, num_surfs + 1, dtype=np.int32))
 
     def tag_for_viz(self):
         """Tags all triangles on all surfaces with the data value for
         that surface. This is for vizualization purposes.
         """
-        for isovol in self.isovol_meshsets.keys():
-            for surf in self.isovol_meshsets[isovol]['surfs_EH']:
-                # get the tagged data
-                val = self.mb.tag_get_data(self.val_tag, surf)
+        # group the triangles of all surfaces by their data value
+        tris_by_val = {}
+        completed_surfs = set()
+        for iv_data in self.isovol_meshsets.values():
+            for surf in iv_data['surfs_EH']:
+                # shared surfaces only need to be tagged once
+                if surf in completed_surfs:
+                    continue
+                completed_surfs.add(surf)
+
+                # get the tagged data (single value on the surface)
+                val = float(self.mb.tag_get_data(self.val_tag, surf,
+                                                 flat=True)[0])
 
                 # get the triangles
                 tris = self.mb.get_entities_by_type(surf,
                                                     types.MBTRI)
+                tris_by_val.setdefault(val, []).append(
+                    np.asarray(tris, dtype=np.uint64))
+
+        # data buffer reused for all values (grown as needed)
+        data = np.empty(0, dtype=np.float64)
+        for val, tris_list in tris_by_val.items():
+            # all triangles with the same value are tagged at once
+            tris = np.concatenate(tris_list)
 
-                # create data array
-                num = len(tris)
-                data = np.full((num), val)
+            # fill data array
+            num = len(tris)
+            if num > len(data):
+                data = np.empty(num, dtype=np.float64)
+            data[:num].fill(val)
 
-                # tag the data
-                self.mb.tag_set_data(self.val_tag, tris, data)
+            # tag the data
+            self.mb.tag_set_data(self.val_tag, tris, data[:num])
 
     def set_tags(self, tags):
         """Set provided tag values on the root set.
@@ -317,11 +362,13 @@ class IsGm(IsoGeomGen):
                 any type.
         """
         rs = self.mb.get_root_set()
+        # buffer for passing single float values
+        scratch = np.empty(1, dtype=np.float64)
         for tagname, tagval in tags.items():
             # get tag size
-            try:
+            if hasattr(tagval, '__len__'):
                 taglength = len(tagval)  # strings or lists of ints/floats
-            except:
+            else:
                 taglength = 1  # can't get length on a single int/float values
 
             # get datatype:
@@ -335,6 +382,9 @@ class IsGm(IsoGeomGen):
                                          tag_type=mbtype,
                                          storage_type=types.MB_TAG_SPARSE,
                                          create_if_missing=True)
+            if taglength == 1 and mbtype == types.MB_TYPE_DOUBLE:
+                scratch[0] = tagval
+                tagval = scratch
             self.mb.tag_set_data(tag, rs, tagval)
 
     def write_geometry(self, sname, sdir):
@@ -342,27 +392,33 @@ class IsGm(IsoGeomGen):
 
         Input:
         ------
-            sname: string, name of file to save written file
+            sname: string, name of file to save written file. If the
+                extension is not .h5m or .vtk, only the last extension
+                is replaced with .h5m.
             sdir: string, absolute path for writing file
         """
         # only write out volumes and surfaces that were not deleted
         vol_list = []
         surf_list = []
-        for isovol in self.isovol_meshsets.keys():
+        for isovol, iv_data in self.isovol_meshsets.items():
             vol_list.append(isovol[1])
-            surf_list.extend(self.isovol_meshsets[isovol]['surfs_EH'])
+            surf_list.extend(iv_data['surfs_EH'])
 
         # convert to ranges and unite
         all_meshsets = unite(Range(set(vol_list)), Range(set(surf_list)))
 
         # check file extension of save name:
-        ext = sname.split(".")[-1]
-        if ext.lower() not in ['h5m', 'vtk']:
+        root, ext = os.path.splitext(sname)
+        if not ext and root.startswith("."):
+            # name is only an extension (eg. .h5m)
+            root, ext = "", root
+        ext = ext.lstrip(".")
+        if ext.lower() not in _VALID_EXTS:
             warnings.warn("File extension {} ".format(ext) +
                           " not recognized. File will be saved as type .h5m.")
-            sname = sname.split(".")[0] + ".h5m"
+            sname = root + ".h5m"
         # save the file
-        save_location = sdir + "/" + sname
+        save_location = os.path.join(sdir, sname)
         self.mb.write_file(save_location, all_meshsets)
         print("Geometry file written to {}.".format(save_location))
 
@@ -381,58 +437,48 @@ class IsGm(IsoGeomGen):
         """
         surf_list = []
 
-        # get set of all vertices for the isosurface
-        remaining_verts = self.mb.get_entities_by_type(ms, types.MBVERTEX)
-        all_tris = set(self.mb.get_entities_by_type(ms, types.MBTRI))
-
-        while len(remaining_verts) > 0:
-            # get full set of connected verts starting from a seed
-            region_verts = [remaining_verts[0]]
-            boundary_verts = [remaining_verts[0]]
-            expanded_region = set(region_verts[:])
-
-            # gather set of all vertices that are connected to the seed
-            while True:
-                # check adjancency and connectedness of new vertices
-                new_connected_verts = \
-                    self.mb.get_adjacencies(self.mb.get_adjacencies(
-                                            boundary_verts, 2, op_type=1),
-                                            0, op_type=1)
-
-                # add newly found verts to all list
-                # only store verts that are present in the full surface
-                expanded_region.update(
-                    set(new_connected_verts) & set(remaining_verts))
-
-                # check if different from already found verts
-                if len(expanded_region) == len(region_verts):
-                    # no more vertices are connected, so full surface
-                    # has been found
-                    break
-                else:
-                    # update vertices list to check only newly found
-                    # vertices
-                    boundary_verts = expanded_region.difference(region_verts)
-                    region_verts = list(expanded_region)
-
-            # get the connected set of triangles that make the single
-            # surface and store into a unique meshset
-            tris = self.__get_surf_triangles(region_verts)
-            # only include tris that already exist in the full meshset
-            tris = list(set(tris) & all_tris)
+        # get all triangles and their connectivity for the isosurface
+        all_tris = np.asarray(self.mb.get_entities_by_type(ms, types.MBTRI),
+                              dtype=np.uint64)
+        if len(all_tris) == 0:
+            return surf_list
+        conn = np.asarray(self.mb.get_connectivity(all_tris),
+                          dtype=np.uint64).reshape(-1, 3)
+
+        # map vertex entity handles to graph node indices
+        all_verts, nodes = np.unique(conn, return_inverse=True)
+        nodes = nodes.reshape(-1, 3)
+
+        # build the vertex graph from the triangle edges and label each
+        # set of connected vertices (labels are ordered by lowest vertex)
+        edges_from = nodes.ravel()
+        edges_to = nodes[:, [1, 2, 0]].ravel()
+        graph = csr_matrix((np.ones(len(edges_from), dtype=bool),
+                            (edges_from, edges_to)),
+                           shape=(len(all_verts), len(all_verts)))
+        num_surfs, vert_labels = connected_components(graph, directed=False)
+        tri_labels = vert_labels[nodes[:, 0]]
+
+        # group triangles and vertices by label in a single pass
+        tri_order = np.argsort(tri_labels)
+        tri_groups = np.split(all_tris[tri_order], np.cumsum(
+            np.bincount(tri_labels, minlength=num_surfs))[:-1])
+        vert_order = np.argsort(vert_labels)
+        vert_groups = np.split(all_verts[vert_order], np.cumsum(
+            np.bincount(vert_labels, minlength=num_surfs))[:-1])
+
+        for tris, verts in zip(tri_groups, vert_groups):
+            # store each connected set of triangles into a unique meshset
             surf = self.mb.create_meshset()
             self.mb.add_entities(surf, tris)
-            self.mb.add_entities(surf, region_verts)
+            self.mb.add_entities(surf, verts)
 
             # store surfaces in completed list
             surf_list.append(surf)
 
-            # remove surface from original meshset
-            self.mb.remove_entities(ms, tris)
-            self.mb.remove_entities(ms, region_verts)
-
-            # resassign vertices that remain
-            remaining_verts = self.mb.get_entities_by_type(ms, types.MBVERTEX)
+        # remove surfaces from original meshset
+        self.mb.remove_entities(ms, all_tris)
+        self.mb.remove_entities(ms, all_verts)
 
         return surf_list
 
@@ -449,25 +495,30 @@ class IsGm(IsoGeomGen):
 
         Returns:
         --------
-            tris: list of entity handles, EHs for the triangles for
+            tris: numpy array of uint64, EHs for the triangles for
                 which all three vertices are in the verts list.
         """
-        tris_all = self.mb.get_adjacencies(verts_good, 2, op_type=1)
-        verts_all = self.mb.get_connectivity(tris_all)
-        verts_bad = set(verts_all) - set(verts_good)
-
-        if verts_bad:
+        verts_good = np.fromiter(verts_good, dtype=np.uint64)
+        tris_all = np.asarray(self.mb.get_adjacencies(verts_good, 2,
+                                                      op_type=1),
+                              dtype=np.uint64)
+        verts_all = np.asarray(self.mb.get_connectivity(tris_all),
+                               dtype=np.uint64)
+        verts_bad = np.setdiff1d(verts_all, verts_good)
+
+        if verts_bad.size:
             # not an empty set
-            tris_bad = self.mb.get_adjacencies(list(verts_bad), 2, op_type=1)
-            tris_good = set(tris_all) - set(tris_bad)
-            return list(tris_good)
+            tris_bad = np.asarray(self.mb.get_adjacencies(verts_bad, 2,
+                                                          op_type=1),
+                                  dtype=np.uint64)
+            return np.setdiff1d(tris_all, tris_bad, assume_unique=True)
         else:
             # empty set so all tris are good
             return tris_all
 
     def __list_coords(self, eh):
-        """Gets list of all coords as a list of tuples for an entity
-        handle eh.
+        """Gets arrays of all vertex entity handles and their coordinates
+        for an entity handle eh.
 
         Input:
         ------
@@ -475,17 +526,16 @@ class IsGm(IsoGeomGen):
 
         Returns:
         --------
-            coords: dictionary, key is the MOAB entity handle for the
-                vertice and the value is a tuple of the coordinate
-                (x, y, z).
+            verts: numpy array of uint64, MOAB entity handles for all
+                vertices in the meshset.
+            coords: numpy array of floats, shape (N, 3), coordinates
+                (x, y, z) for each vertex in verts.
         """
-        # list of all entity handles for all vertices
-        all_verts_eh = self.mb.get_entities_by_type(eh, types.MBVERTEX)
-        coords = {}
-        for v in all_verts_eh:
-            coord = tuple(self.mb.get_coords(v))
-            coords[v] = coord
-        return coords
+        # get all vertices and their coordinates in a single call
+        verts = np.asarray(self.mb.get_entities_by_type(eh, types.MBVERTEX),
+                           dtype=np.uint64)
+        coords = np.asarray(self.mb.get_coords(verts)).reshape(-1, 3)
+        return verts, coords
 
     def __compare_surfs(self, v1, v2, norm):
         """finds coincident surfaces between two isovolumes.
@@ -495,6 +545,12 @@ class IsGm(IsoGeomGen):
             v1/2: tuple, corresponds to the dictionary keys for two
                 isovolumes in self.isovol_meshsets that will be compared
             norm: float, All data values will be multiplied by this factor.
+
+        Returns:
+        --------
+            merged_surfs: list of entity handles, surfaces in v1 that are
+                now shared with v2 and have been tagged with sense and
+                value information.
         """
         print("comparing surfaces in isovolumes {} and {}.".format(
             v1[0], v2[0]))
@@ -511,34 +567,41 @@ class IsGm(IsoGeomGen):
         #   value: surf in v1 to replace it with
         surfs_to_remove = {}
 
+        # get coordinates of all interior surfaces in v1 (s1) once
+        coords1 = {}
+        for s1 in self.isovol_meshsets[v1]['surfs_EH']:
+            surf_type = self.mb.tag_get_data(surf_type_tag, s1)
+            if surf_type == 'interior':
+                coords1[s1] = self.__list_coords(s1)[1]
+
+        # get vertices of all interior surfaces in v2 (s2) once and build
+        # a nearest neighbor search tree on their coordinates
+        # (tree is set to None if s2 has no vertices left to match)
+        verts2 = {}
+        trees2 = {}
+        for s2 in self.isovol_meshsets[v2]['surfs_EH']:
+            surf_type = self.mb.tag_get_data(surf_type_tag, s2)
+            if surf_type == 'interior':
+                verts2[s2], coords2 = self.__list_coords(s2)
+                if len(coords2) > 0:
+                    trees2[s2] = cKDTree(coords2)
+                else:
+                    trees2[s2] = None
+
         # compare all interior surfaces in v1 (s1) to all
         # interior surfaces in v2 (s2)
         for s1 in self.isovol_meshsets[v1]['surfs_EH']:
-
-            # check if s1 is interior surf
-            surf_type = self.mb.tag_get_data(surf_type_tag, s1)
-            if surf_type != 'interior':
+            if s1 not in coords1 or len(coords1[s1]) == 0:
                 continue
 
-            # get list of all coordinates in s1
-            verts1 = self.__list_coords(s1)
-
             for s2 in self.isovol_meshsets[v2]['surfs_EH']:
-                # check surf type
-                surf_type = self.mb.tag_get_data(surf_type_tag, s2)
-                if surf_type != 'interior':
+                if trees2.get(s2) is None:
                     continue
 
-                # get surface 2 vertices
-                verts2 = self.__list_coords(s2)
-
                 # check if any vertex matches between the two surfaces
-                match = False
-                for coord1 in verts1.values():
-                    if coord1 in verts2.values():
-                        # exact match, don't need to check anymore
-                        match = True
-                        break
+                # (distance of 0 is an exact match)
+                dist, _ = trees2[s2].query(coords1[s1], k=1)
+                match = np.any(dist == 0.)
 
                 if match:
                     # match was found so s1 and s2 are coincident
@@ -546,11 +609,14 @@ class IsGm(IsoGeomGen):
                     tris2 = self.mb.get_entities_by_type(s2, types.MBTRI)
                     self.mb.remove_entities(s2, tris2)
                     self.mb.remove_entities(v2[1], tris2)
-                    self.mb.remove_entities(s2, verts2.keys())
-                    self.mb.remove_entities(v2[1], verts2.keys())
+                    self.mb.remove_entities(s2, verts2[s2])
+                    self.mb.remove_entities(v2[1], verts2[s2])
                     self.mb.delete_entities(tris2)
                     surfs_to_remove[s2] = s1
 
+                    # s2 is now empty so it cannot match again
+                    trees2[s2] = None
+
         # remove the matched surfaces from volume 2
         # assign sense and value tags
         for s2, s1 in surfs_to_remove.items():
@@ -576,25 +642,31 @@ class IsGm(IsoGeomGen):
                 val = shared[0] * norm
             self.mb.tag_set_data(self.val_tag, s1, val)
 
+        return list(surfs_to_remove.values())
+
     def __calc_centroid(self, coords):
-        """Calculate the centroid of a list of three coordinates.
+        """Calculate the centroids of a set of triangles from a list of
+        their coordinates.
 
         Inputs:
         -------
-            coords: list of floats, x, y, and z coordinates of three
-                points to calculate centroid. list should be ordered as:
-                [x1, y1, z1, x2, y2, z2, x3, y3, z3]
+            coords: list of floats, x, y, and z coordinates of the three
+                points of each triangle to calculate centroid. list
+                should be ordered as: [x1, y1, z1, x2, y2, z2, x3, y3, z3]
+                for each triangle.
 
         Returns:
         --------
-            centroid: list of floats, coordinates of the centroid [x, y, z]
+            centroids: numpy array of floats, shape (N, 3), coordinates of
+                the centroid [x, y, z] of each of the N triangles
         """
-        if len(coords) != 9:
+        if len(coords) % 9 != 0:
             raise RuntimeError("Cannot calculate centroid. List of " +
                                "coordinates is incorrect size.")
-        # reshape into list of 3 coordinates [[x2,y2,z2],[x2,y2,z2],[x3,y3,z3]]
-        # calculate average along columns (axis 0) to get average x, y, and z
-        return np.mean(np.resize(coords, (3, 3)), axis=0)
+        # reshape into (N, 3, 3) of three coordinates for each triangle
+        # calculate average over the points (axis 1) to get average x, y,
+        # and z of each triangle
+        return np.mean(np.reshape(coords, (-1, 3, 3)), axis=1)
 
     def __check_exterior(self, coord):
         """for a given position [x, y, z] check if it is on the exterior
@@ -602,16 +674,16 @@ class IsGm(IsoGeomGen):
 
         Inputs:
         -------
-            coord: list of floats, [x, y, z]
+            coord: list of floats, [x, y, z], or array of floats with
+                shape (N, 3) to check N positions at once
 
         Returns:
         --------
             True: located on exterior surface
             False: not located on exterior surface
+            (array of True/False for each position if N positions given)
         """
-        if (coord[0] == self.xmin) or (coord[0] == self.xmax) or \
-           (coord[1] == self.ymin) or (coord[1] == self.ymax) or \
-           (coord[2] == self.zmin) or (coord[2] == self.zmax):
-            return True
-        else:
-            return False
+        coord = np.asarray(coord)
+        mins = [self.xmin, self.ymin, self.zmin]
+        maxs = [self.xmax, self.ymax, self.zmax]
+        return np.any((coord == mins) | (coord == maxs), axis=-1)
@@ -78,11 +78,9 @@ class IsoGeomGen(object):
             except IOError:
                 raise RuntimeError("Level file {} does not " +
                                    "exist.".format(levels))
-            levels_list = []
-            lines = f.readlines()
-            for line in lines:
-                levels_list.append(line)
-            self.__assign_levels(levels_list)
+            # parse values directly from the lines of the file
+            with f:
+                self.__assign_levels(f)
             return
         else:
             raise RuntimeError("Type of levels provided not allowed. " +
@@ -93,7 +91,8 @@ class IsoGeomGen(object):
 
         Input:
         ------
-            levels: list of floats, values to use for levels
+            levels: list of floats (or iterable of values that can be
+                converted to floats), values to use for levels
         """
         # make sure values are floats
         levels = [float(i) for i in levels]
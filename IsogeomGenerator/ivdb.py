@@ -84,6 +84,10 @@ class IvDb(IsoGeomGen):
         v.AddPlot("Pseudocolor", self.data)
         v.DrawPlots()
 
+        # operator and export settings (reused for every isovolume)
+        iso_att = v.IsovolumeAttributes()
+        export_att = self.__export_attributes()
+
         # iterate over all isovolume levels
         for i, l in enumerate(self.levels):
             res = 0
@@ -100,7 +104,8 @@ class IvDb(IsoGeomGen):
 
                 # get volume
                 # res = 0 if no level found (should update to next level)
-                res, ubound = self.__get_isovol(lbound, ubound, i)
+                res, ubound = self.__get_isovol(lbound, ubound, i,
+                                                iso_att, export_att)
 
         # delete plots
         v.DeleteAllPlots()
@@ -133,7 +138,7 @@ class IvDb(IsoGeomGen):
             warnings.warn("Database {} exists. Using {} " +
                           "instead.".format(self.db, new_dir))
             self.db = new_dir
-        os.makedirs(self.db + "/vols/")
+        os.makedirs(os.path.join(self.db, "vols"))
 
     def __check_data(self, filename):
         """Read data using meshio to get min and max and make sure
@@ -174,22 +179,48 @@ class IvDb(IsoGeomGen):
 
         return arbmin, arbmax, mins, maxs
 
-    def __get_isovol(self, lbound, ubound, i):
+    def __export_attributes(self):
+        """Create the VisIt export settings for writing isovolume surfaces
+        as STL files to the database.
+
+        Return:
+        -------
+            e: VisIt ExportDBAttributes object, the file name must be set
+                for each isovolume exported.
+        """
+        e = v.ExportDBAttributes()
+        e.dirname = os.path.join(self.db, "vols", "")
+        e.db_type = "STL"
+        e.variables = self.data
+        return e
+
+    def __get_isovol(self, lbound, ubound, i, iso_att=None,
+                     export_att=None):
         """Gets the volume selection for isovolume and export just the
         outer surface of the volume as STL.
 
         Input:
         ------
             lbound: float, lower boundary value for the isovolume
-            ubound: float, upper boundary value for the isovolume
-            i: int, surface number
+            ubound: float, upper boundary value for the isovolume. Must
+                be the level value self.levels[i], which is dropped if
+                there is no data to export.
+            i: int, surface number (index of ubound in self.levels)
+            iso_att: (optional), VisIt IsovolumeAttributes object to
+                reuse for setting the isovolume bounds
+            export_att: (optional), VisIt ExportDBAttributes object from
+                __export_attributes() to reuse for exporting the surface
         """
+        if iso_att is None:
+            iso_att = v.IsovolumeAttributes()
+        if export_att is None:
+            export_att = self.__export_attributes()
+
         # generate isovolume
         v.AddOperator("Isovolume")
-        att = v.IsovolumeAttributes()
-        att.lbound = lbound
-        att.ubound = ubound
-        v.SetOperatorOptions(att)
+        iso_att.lbound = lbound
+        iso_att.ubound = ubound
+        v.SetOperatorOptions(iso_att)
 
         # set operator setting to only get surfaces meshes
         v.AddOperator("ExternalSurface")
@@ -198,12 +229,8 @@ class IvDb(IsoGeomGen):
         v.DrawPlots()
 
         # export current volume to folder
-        e = v.ExportDBAttributes()
-        e.dirname = self.db + "/vols/"
-        e.db_type = "STL"
-        e.filename = str(i)
-        e.variables = self.data
-        export_res = v.ExportDatabase(e)
+        export_att.filename = str(i)
+        export_res = v.ExportDatabase(export_att)
 
         # check if exporting was successful or not and adjust values
         if export_res == 0:
@@ -213,16 +240,15 @@ class IvDb(IsoGeomGen):
                 + "{} and {}.\n".format(lbound, ubound) \
                 + "Increasing upper bound to next selected level."
             warnings.warn(warn_message)
-            if ubound == max(self.levels):
+            # ubound is self.levels[i] (as passed in by generate_vols)
+            if i == len(self.levels) - 1:
                 # already at max so do not need to export more levels
-                self.levels.remove(ubound)
+                self.levels.pop(i)
                 export_res = 1
             else:
                 # update to next level to try again
-                index = self.levels.index(ubound)
-                ubound_old = ubound
-                ubound = self.levels[index + 1]
-                self.levels.remove(ubound_old)
+                ubound = self.levels[i + 1]
+                self.levels.pop(i)
         # delete the operators
         v.RemoveAllOperators()
 
@@ -9,11 +9,21 @@ import pytest
 # log: (6, 1, 1e5, 'log', [1, 10, 1e2, 1e3, 1e4, 1e5])
 # ratio, max included: (5, 1, 625, 'ratio', [1., 5., 25., 125., 625.])
 # ratio, max not included: (5, 1, 700, 'ratio', [1., 5., 25., 125., 625.])
+# ratio, max with rounding: (10, 1e-5, 1e3, 'ratio', [1e-5, ..., 1e3])
+# ratio, max less than min: (5, 1, 0, 'ratio', [1.])
 @pytest.mark.parametrize("N,minN,maxN,mode,exp",
                          [(6, 5, 15, 'lin', [5., 7., 9., 11., 13., 15.]),
                           (6, 1, 1e5, 'log', [1, 10, 1e2, 1e3, 1e4, 1e5]),
                           (5, 1, 625, 'ratio', [1., 5., 25., 125., 625.]),
-                          (5, 1, 700, 'ratio', [1., 5., 25., 125., 625.])])
+                          (5, 1, 700, 'ratio', [1., 5., 25., 125., 625.]),
+                          (10, 1e-5, 1e3, 'ratio',
+                           [1e-5, 1e-4, 1e-3, 1e-2, 0.1, 1., 10., 1e2,
+                            1e3]),
+                          (10, 1e-5, 1e6, 'ratio',
+                           [1e-5, 1e-4, 1e-3, 1e-2, 0.1, 1., 10., 1e2,
+                            1e3, 1e4, 1e5, 1e6]),
+                          (5, 1, 0, 'ratio', [1.]),
+                          (5, 1, -10, 'ratio', [1.])])
 def test_generate_levels(N, minN, maxN, mode, exp):
     """generate levels with different modes"""
     obs = driver.generate_levels(N, minN, maxN, mode=mode)
@@ -26,3 +36,18 @@ def test_generate_levels_error():
         exp = driver.generate_levels(6, 5, 1e5, mode='nonsense')
     assert 'Level generation' in str(error_info)
 
+
+@pytest.mark.parametrize("N", [1, 0.5])
+def test_generate_levels_ratio_error(N):
+    """generate levels in ratio mode with a ratio that does not increase"""
+    with pytest.raises(RuntimeError) as error_info:
+        exp = driver.generate_levels(N, 1, 100, mode='ratio')
+    assert 'greater than 1' in str(error_info)
+
+
+@pytest.mark.parametrize("minN", [0, -1])
+def test_generate_levels_ratio_min_error(minN):
+    """generate levels in ratio mode with a minimum that is not positive"""
+    with pytest.raises(RuntimeError) as error_info:
+        exp = driver.generate_levels(5, minN, 100, mode='ratio')
+    assert 'greater than 0' in str(error_info)
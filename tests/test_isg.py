@@ -6,6 +6,7 @@ from pymoab import core, types
 import numpy as np
 import itertools
 import warnings
+import shutil
 
 from IsogeomGenerator import isg, ivdb
 
@@ -185,6 +186,38 @@ def test_read_database():
     assert(all(res))
 
 
+def test_read_database_numerical_order():
+    """files are read in numerical (not alphabetical) order of index"""
+    # make a database with more than 10 isovolume files
+    db = test_dir + "/order-db/"
+    if isdir(db):
+        shutil.rmtree(db)
+    mkdir(db)
+    mkdir(db + "/vols")
+    num_files = 12
+    for i in range(num_files):
+        shutil.copy(exp_vols_dir + "/0.stl", db + "/vols/{}.stl".format(i))
+    # one level per file (the last level is the upper bound of the data)
+    order_levels = [float(i) for i in range(1, num_files + 1)]
+    # create obj and read database
+    ig = isg.IsGm(levels=order_levels, data=data, db=db)
+    ig.read_database()
+    shutil.rmtree(db)
+    r = np.full(num_files + 1, False)
+    # meshsets are created in the order the files are read
+    iv_keys = sorted(ig.isovol_meshsets, key=lambda iv: iv[1])
+    if [iv[0] for iv in iv_keys] == list(range(num_files)):
+        r[0] = True
+    # check bounds match each index
+    for iv in iv_keys:
+        i = iv[0]
+        lbound = order_levels[i - 1] if i > 0 else None
+        ubound = order_levels[i]
+        if ig.isovol_meshsets[iv]['bounds'] == (lbound, ubound):
+            r[i + 1] = True
+    assert(all(r))
+
+
 def test_read_database_numfiles_error():
     """read_database throws error if num levels and files mismatch"""
     # create obj and read database
@@ -333,6 +366,58 @@ def test_separate_isovols_single_interior():
     assert(all(r))
 
 
+def test_separate_isovols_interior_touching_exterior():
+    """interior patches joined only by an exterior tri stay separate"""
+    ig = isg.IsGm()
+    fs = ig.mb.create_meshset()
+    # vertices a and b lie on the exterior x plane (x = 0), one for
+    # each interior patch, and the exterior triangle connects them
+    coords = np.array([0., 0., 0.,  # a
+                       0., 4., 0.,  # b
+                       0., 2., 2.,  # exterior only
+                       1., 0., 0., 1., 1., 0.,  # patch 1
+                       1., 4., 0., 1., 5., 0.])  # patch 2
+    verts = ig.mb.create_vertices(coords)
+    tris = [ig.mb.create_element(types.MBTRI, [verts[0], verts[1],
+                                               verts[2]]),
+            ig.mb.create_element(types.MBTRI, [verts[0], verts[3],
+                                               verts[4]]),
+            ig.mb.create_element(types.MBTRI, [verts[1], verts[5],
+                                               verts[6]])]
+    ig.mb.add_entities(fs, tris)
+    ig.mb.add_entities(fs, verts)
+    # create useable meshset dict
+    ig.isovol_meshsets[(0, fs)] = {}
+    # only the x = 0 plane is on the exterior of the geometry
+    ig.xmin = 0.
+    ig.xmax = 15.
+    ig.ymin = ig.zmin = -15.
+    ig.ymax = ig.zmax = 15.
+    # separate the volumes
+    ig.separate_isovols()
+    # check there are three surfaces (exterior is first in list)
+    r = np.full(4, False)
+    surfs = ig.isovol_meshsets[(0, fs)]['surfs_EH']
+    if len(surfs) == 3:
+        r[0] = True
+    # check the exterior surface is only the exterior triangle
+    ext_tris = list(ig.mb.get_entities_by_type(surfs[0], types.MBTRI))
+    if ext_tris == [tris[0]]:
+        r[1] = True
+    # check each interior patch is its own surface
+    int_tris = sorted([list(ig.mb.get_entities_by_type(s, types.MBTRI))
+                       for s in surfs[1:]])
+    if int_tris == sorted([[tris[1]], [tris[2]]]):
+        r[2] = True
+    # check the interior surfaces do not share any vertices
+    verts1 = set(ig.mb.get_entities_by_type(surfs[1], types.MBVERTEX))
+    verts2 = set(ig.mb.get_entities_by_type(surfs[2], types.MBVERTEX))
+    if len(verts1) == 3 and len(verts2) == 3 and \
+            len(verts1 & verts2) == 0:
+        r[3] = True
+    assert(all(r))
+
+
 def __setup_geom():
     """function for other tests to create a useable isogeom object"""
     # load two coincident volumes that need merging
@@ -516,6 +601,42 @@ def test_tag_for_viz():
     assert(vals_exp == vals_out)
 
 
+def test_tag_for_viz_multiple_surfs():
+    """test viz tags with shared values and a surface shared by vols"""
+    ig = isg.IsGm()
+    verts = ig.mb.create_vertices(np.array([0., 0., 0.,
+                                            1., 0., 0.,
+                                            0., 1., 0.]))
+    # surfaces (number of triangles, value): two share a value, one
+    # has a different value, and one is in both volumes
+    surf_info = [(3, 1.0), (1, 1.0), (2, 2.0), (4, 3.0)]
+    surfs = []
+    for num_tris, val in surf_info:
+        surf = ig.mb.create_meshset()
+        tris = [ig.mb.create_element(types.MBTRI, verts)
+                for i in range(num_tris)]
+        ig.mb.add_entities(surf, tris)
+        ig.mb.tag_set_data(ig.val_tag, surf, val)
+        surfs.append(surf)
+    vol0 = ig.mb.create_meshset()
+    vol1 = ig.mb.create_meshset()
+    ig.isovol_meshsets[(0, vol0)] = {'surfs_EH': [surfs[0], surfs[3]]}
+    ig.isovol_meshsets[(1, vol1)] = {'surfs_EH': [surfs[1], surfs[2],
+                                                  surfs[3]]}
+    # tag for viz
+    ig.tag_for_viz()
+    # test viz tags on every triangle of every surface
+    r = np.full(len(surfs), False)
+    for i, surf in enumerate(surfs):
+        num_tris, val = surf_info[i]
+        all_tris = ig.mb.get_entities_by_type(surf, types.MBTRI)
+        vals_out = list(ig.mb.tag_get_data(ig.val_tag, all_tris,
+                                           flat=True))
+        if vals_out == list(np.full(num_tris, val)):
+            r[i] = True
+    assert(all(r))
+
+
 @pytest.mark.parametrize("tagname, tagval, expname, expval, exptype",
                          [('int_tag', 1, 'int_tag', [1], np.int32),
                           ('float_tag', 2.0, 'float_tag', [2.0], np.float64),
@@ -593,6 +714,51 @@ def test_write_geometry_ext():
     assert(all(r))
 
 
+def test_write_geometry_ext_multiple_dots():
+    """only the last extension is replaced for a name with several dots"""
+    r = np.full(4, False)
+    # write file with incorrect extension
+    ig = isg.IsGm()
+    sname = 'write.test.bad'
+    # check for a warning
+    with warnings.catch_warnings(record=True) as w:
+        ig.write_geometry(sname, test_dir)
+        warnings.simplefilter("always")
+    r[0:2] = __check_warning(w, ["File will be saved as type .h5m"], 1)
+    # check that file exists
+    good_file = test_dir + '/write.test.h5m'
+    bad_file = test_dir + '/' + sname
+    if isfile(good_file):
+        # check that only the last extension was changed
+        r[2] = True
+        remove(good_file)
+    if not isfile(bad_file):
+        # check that bad name was not used
+        r[3] = True
+    else:
+        # file exists, needs removed
+        remove(bad_file)
+    assert(all(r))
+
+
+def test_write_geometry_ext_only():
+    """a name that is only a valid extension is written without warning"""
+    r = np.full(2, False)
+    ig = isg.IsGm()
+    sname = '.h5m'
+    with warnings.catch_warnings(record=True) as w:
+        ig.write_geometry(sname, test_dir)
+        warnings.simplefilter("always")
+    if len(w) == 0:
+        r[0] = True
+    # check that file exists with the name unchanged
+    exp_file = test_dir + '/' + sname
+    if isfile(exp_file):
+        r[1] = True
+        remove(exp_file)
+    assert(all(r))
+
+
 def test_get_surf_triangles():
     """get triangles when one coord is not good"""
     # setup IsGm instance
@@ -641,7 +807,7 @@ def test_get_surf_triangles_all():
 
 
 def test_list_coords():
-    """test list coords returns correct dictionary"""
+    """test list coords returns correct vertex and coordinate arrays"""
     # setup IsGm instance
     ig = isg.IsGm()
     ig.mb = core.Core()
@@ -650,10 +816,14 @@ def test_list_coords():
     ig.mb.create_vertices(coords)
     rs = ig.mb.get_root_set()
     eh = list(ig.mb.get_entities_by_type(rs, types.MBVERTEX))[0]
-    exp_coords_dict = {eh: (1., 2., 3.)}
     # list coords
-    coords_out = ig._IsGm__list_coords(rs)
-    assert(exp_coords_dict == coords_out)
+    verts_out, coords_out = ig._IsGm__list_coords(rs)
+    r = np.full(2, False)
+    if list(verts_out) == [eh]:
+        r[0] = True
+    if coords_out.tolist() == [[1., 2., 3.]]:
+        r[1] = True
+    assert(all(r))
 
 
 def test_compare_surfs():
@@ -735,7 +905,19 @@ def test_calc_centroid():
     # z = (0 + 0 + 3)/3 = 1
     exp_centroid = [1., 1., 1.]
     centroid = ig._IsGm__calc_centroid(coords)
-    assert(exp_centroid == list(centroid))
+    assert([exp_centroid] == centroid.tolist())
+
+
+def test_calc_centroid_multiple():
+    """test centroid calculation for more than one triangle at once"""
+    ig = isg.IsGm()
+    # triangles defined by coordinates (3, 0, 0), (0, 3, 0), (0, 0, 3) and
+    # (6, 0, 0), (0, 6, 0), (0, 0, 6)
+    coords = [3., 0., 0., 0., 3., 0., 0., 0., 3.,
+              6., 0., 0., 0., 6., 0., 0., 0., 6.]
+    exp_centroids = [[1., 1., 1.], [2., 2., 2.]]
+    centroids = ig._IsGm__calc_centroid(coords)
+    assert(exp_centroids == centroids.tolist())
 
 
 def test_calc_centroid_error():
@@ -771,3 +953,14 @@ def test_check_exterior_false():
     point = [0, 0, 0]  # interior
     result = ig._IsGm__check_exterior(point)
     assert(not result)
+
+
+def test_check_exterior_multiple():
+    """test that several points are checked at once"""
+    ig = isg.IsGm()
+    # define the geometric extents to be -5 to 5 in all directions
+    ig.xmin = ig.ymin = ig.zmin = -5.
+    ig.xmax = ig.ymax = ig.zmax = 5.
+    points = [[0, 0, 0], [5, 0, 0], [0, -5, 0], [1, 2, 3]]
+    result = ig._IsGm__check_exterior(points)
+    assert(list(result) == [False, True, True, False])